@@ -3,7 +3,10 @@
 """Init script for network_crawler."""
 
 from api.operator_web_site import OperatorWebSite
-__all__ = [OperatorWebSite, ]
+from api.async_operator_web_site import AsyncOperatorWebSite
+from api.tariff_service import TariffIndex, TariffService
+__all__ = [OperatorWebSite, AsyncOperatorWebSite,
+           TariffIndex, TariffService, ]
 
 __author__ = 'Luigi Riefolo'
 __version__ = '1.0'
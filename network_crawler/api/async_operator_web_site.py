@@ -0,0 +1,75 @@
+#!/usr/bin/env python
+# -*- encoding: utf-8 -*-
+
+import logging
+import time
+
+try:
+    from selenium.webdriver.common.by import By
+except ImportError as imp_err:
+    raise ImportError('Failed to import \'selenium\':\n' + str(imp_err))
+
+from operator_web_site import OperatorWebSite
+
+
+"""
+Non-blocking network operator's website API.
+"""
+
+
+class AsyncOperatorWebSite(OperatorWebSite):
+    """
+    A non-blocking network operator's website class.
+
+    Attributes:
+        @param driver: Selenium webdriver.
+        @param data: Dict containing the URL, the list of actions,
+                     the list of country zones and th time to wait
+                     for a page element page to be loaded.
+        @param window_handle: Optional handle of the browser tab the
+                              object is bound to.
+
+    The actions are coroutines: they return a generator which yields
+    the number of seconds to wait before resuming it, instead of
+    blocking while a page element is loaded. The result of the last
+    action is stored in 'result', None if its element was not loaded.
+    """
+
+    # Seconds between two checks for a page element
+    poll_time = 0.1
+
+    def __init__(self, driver, data, window_handle=None):
+        """ """
+        super(AsyncOperatorWebSite, self).__init__(driver, data, window_handle)
+        self.result = None
+
+    def run_element_method(self, path, method_name, args=None):
+        """
+        Run a web driver element method.
+
+        It yields until the element exists or the load time expires,
+        then runs the requested method with any optional arguments.
+        """
+        self.result = None
+        deadline = time.time() + self.load_time
+        while True:
+            self.switch_to_window()
+            element = self.find_element(path)
+            if element is not None:
+                break
+
+            if time.time() >= deadline:
+                logging.error('Loading \'%s\' took too much time', path)
+                return
+
+            yield self.poll_time
+
+        self.result = self.call_element_method(element, method_name, args)
+
+    def find_element(self, path):
+        """ Return an element if it is already loaded, None otherwise. """
+        elements = self.driver.find_elements(By.XPATH, path)
+        if not elements:
+            return None
+
+        return elements[0]
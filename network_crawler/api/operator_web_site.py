@@ -28,18 +28,60 @@ class OperatorWebSite(object):
         @param data: Dict containing the URL, the list of actions,
                      the list of country zones and th time to wait
                      for a page element page to be loaded.
+        @param window_handle: Optional handle of the browser tab the
+                              object is bound to. When set, the tab is
+                              selected before each action, so several
+                              objects can share the same driver.
 
     It implements a series of methods used to perfom
     specific action on a network operator's website.
     """
 
-    def __init__(self, driver, data):
+    def __init__(self, driver, data, window_handle=None):
         """ """
         self.driver = driver
         self.url = data['url']
         self.actions = data['actions']
         self.zones = data['zones']
         self.load_time = data['load_time']
+        self.window_handle = window_handle
+
+    @classmethod
+    def open_tab(cls, driver, data):
+        """
+        Open the URL in a new browser tab and return an object bound to it.
+
+        The page is loaded by the browser in the background,
+        so several tabs can load at the same time.
+        """
+        handles = set(driver.window_handles)
+        driver.execute_script('window.open(arguments[0]);', data['url'])
+        window_handle = (set(driver.window_handles) - handles).pop()
+        logging.debug('Opened tab \'%s\' for \'%s\'',
+                      window_handle, data['url'])
+
+        return cls(driver, data, window_handle)
+
+    def close_tab(self):
+        """
+        Close the browser tab the object is bound to, if any.
+
+        Another tab is selected afterwards, since the driver
+        cannot run any command in a closed window.
+        """
+        if self.window_handle is not None:
+            self.switch_to_window()
+            self.driver.close()
+            self.window_handle = None
+
+            handles = self.driver.window_handles
+            if handles:
+                self.driver.switch_to.window(handles[0])
+
+    def switch_to_window(self):
+        """ Select the browser tab the object is bound to, if any. """
+        if self.window_handle is not None:
+            self.driver.switch_to.window(self.window_handle)
 
     def get_actions(self):
         """ Returns the list of actions. """
@@ -56,10 +98,19 @@ class OperatorWebSite(object):
         It checks whether the element exists and
         runs the requested method with any optional arguments.
         """
+        self.switch_to_window()
         element = self.get_element(self.driver, path)
         if element is None:
             return False
 
+        return self.call_element_method(element, method_name, args)
+
+    def call_element_method(self, element, method_name, args=None):
+        """
+        Call a method of a loaded element.
+
+        Properties are returned as they are.
+        """
         ret = False
         attr = self.get_attr(element, method_name)
         # Function attribute
@@ -0,0 +1,261 @@
+#!/usr/bin/env python
+# -*- encoding: utf-8 -*-
+
+import json
+import logging
+import os
+import threading
+
+try:
+    from BaseHTTPServer import BaseHTTPRequestHandler, HTTPServer
+    from SocketServer import ThreadingMixIn
+    from urllib import unquote
+except ImportError:
+    from http.server import BaseHTTPRequestHandler, HTTPServer
+    from socketserver import ThreadingMixIn
+    from urllib.parse import unquote
+
+
+"""
+Local query service over the crawled calling costs.
+"""
+
+
+class TariffIndex(object):
+    """
+    In-memory indexes over a crawl result.
+
+    Attributes:
+        @param data: Dict containing the list of operators, as written
+                     by the crawler in JSON mode, each one with its
+                     'costs' dict mapping a zone to its cost.
+
+    Zone and operator names are matched case-insensitively.
+    The per-zone rankings are sorted by cost when the index is built,
+    so that every lookup is a single dict access.
+    """
+
+    def __init__(self, data):
+        """ """
+        self.operators = dict()
+        self.zones = dict()
+
+        for operator in data.get('operators', []):
+            name = operator['name']
+            costs = dict()
+            for zone, cost in operator.get('costs', {}).items():
+                try:
+                    value = float(cost)
+                except (TypeError, ValueError):
+                    logging.warning('Skipping invalid cost \'%s\' for '
+                                    '\'%s\', zone \'%s\'', cost, name, zone)
+                    continue
+
+                costs[zone] = value
+                ranking = self.zones.setdefault(
+                    self.get_key(zone), {'zone': zone, 'ranking': []})
+                ranking['ranking'].append(
+                    {'operator': name, 'cost': value})
+
+            self.operators[self.get_key(name)] = {
+                'operator': name, 'costs': costs}
+
+        # Precompute the per-zone rankings
+        for zone_data in self.zones.values():
+            zone_data['ranking'].sort(
+                key=lambda entry: (entry['cost'], entry['operator']))
+
+    @staticmethod
+    def get_key(name):
+        """ Returns the index key for a zone or operator name. """
+        return name.strip().lower()
+
+    def get_operators(self):
+        """ Returns the list of operator names. """
+        return sorted(entry['operator'] for entry in self.operators.values())
+
+    def get_zones(self):
+        """ Returns the list of country zones. """
+        return sorted(entry['zone'] for entry in self.zones.values())
+
+    def get_operator(self, name):
+        """ Returns all the costs of an operator, or None. """
+        return self.operators.get(self.get_key(name))
+
+    def get_zone(self, zone):
+        """ Returns the operators ranked by cost for a zone, or None. """
+        return self.zones.get(self.get_key(zone))
+
+    def get_cheapest(self, zone):
+        """ Returns the cheapest operator for a zone, or None. """
+        zone_data = self.get_zone(zone)
+        if zone_data is None or not zone_data['ranking']:
+            return None
+
+        return dict(zone_data['ranking'][0], zone=zone_data['zone'])
+
+
+class TariffRequestHandler(BaseHTTPRequestHandler):
+    """
+    HTTP handler for the tariff queries.
+
+    Available routes:
+        GET /operators
+        GET /operators/<operator>
+        GET /zones
+        GET /zones/<zone>
+        GET /zones/<zone>/cheapest
+    """
+
+    def do_GET(self):
+        """ Dispatch a GET request to the requested index. """
+        index = self.server.service.index
+        parts = [self.unquote(part) for part in
+                 self.path.split('?')[0].strip('/').split('/') if part]
+
+        res = None
+        if parts == ['operators']:
+            res = index.get_operators()
+        elif parts == ['zones']:
+            res = index.get_zones()
+        elif len(parts) == 2 and parts[0] == 'operators':
+            res = index.get_operator(parts[1])
+        elif len(parts) == 2 and parts[0] == 'zones':
+            res = index.get_zone(parts[1])
+        elif len(parts) == 3 and parts[0] == 'zones' \
+                and parts[2] == 'cheapest':
+            res = index.get_cheapest(parts[1])
+
+        if res is None:
+            self.send_json(404, {'error': 'Not found: %s' % self.path})
+        else:
+            self.send_json(200, res)
+
+    @staticmethod
+    def unquote(part):
+        """
+        Returns a percent-decoded path part as text.
+
+        Python 2 decodes it to UTF-8 bytes, while the
+        names in the indexes come from JSON as unicode.
+        """
+        part = unquote(part)
+        if isinstance(part, bytes):
+            part = part.decode('utf-8', 'replace')
+
+        return part
+
+    def send_json(self, code, obj):
+        """ Write a JSON response. """
+        body = json.dumps(obj).encode('utf-8')
+        self.send_response(code)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, fmt, *args):
+        """ Redirect the access log to the logging module. """
+        logging.debug('%s - %s', self.address_string(), fmt % args)
+
+
+class TariffHTTPServer(ThreadingMixIn, HTTPServer):
+    """ Threaded HTTP server holding a reference to its service. """
+    daemon_threads = True
+
+    def __init__(self, address, handler, service):
+        """ """
+        HTTPServer.__init__(self, address, handler)
+        self.service = service
+
+
+class TariffService(object):
+    """
+    Serves a crawl result file over a local HTTP API.
+
+    Attributes:
+        @param file_name: JSON file written by the crawler.
+        @param host: Address to bind to.
+        @param port: Port to listen on.
+        @param reload_time: Seconds between checks for a new crawl result.
+
+    The file is watched in a background thread and the indexes are
+    rebuilt whenever it changes. A new index replaces the old one only
+    once it is complete, so queries always see a consistent crawl.
+    """
+
+    def __init__(self, file_name, host='127.0.0.1', port=8080,
+                 reload_time=1):
+        """ """
+        self.file_name = file_name
+        self.host = host
+        self.port = port
+        self.reload_time = reload_time
+        self.index = TariffIndex({})
+        self.signature = None
+        self.stopped = threading.Event()
+        self.server = None
+
+    def get_signature(self):
+        """ Returns the modification time and size of the file. """
+        try:
+            stat = os.stat(self.file_name)
+        except OSError:
+            return None
+
+        return (stat.st_mtime, stat.st_size)
+
+    def reload(self):
+        """
+        Rebuild the indexes if the file has changed.
+
+        The current indexes are kept if the file is missing, does not
+        contain valid JSON yet, e.g. while a crawl is still writing it,
+        or does not contain a crawl result.
+        """
+        signature = self.get_signature()
+        if signature is None or signature == self.signature:
+            return False
+
+        try:
+            with open(self.file_name, 'r') as data_file:
+                data = json.loads(data_file.read())
+            index = TariffIndex(data)
+        except (IOError, OSError, ValueError) as err:
+            logging.warning('Could not load \'%s\': %s', self.file_name, err)
+            return False
+        except (AttributeError, KeyError, TypeError) as err:
+            logging.warning('Invalid crawl result \'%s\': %s',
+                            self.file_name, repr(err))
+            return False
+
+        self.index = index
+        self.signature = signature
+        logging.info('Loaded \'%s\': %d operators, %d zones',
+                     self.file_name, len(self.index.operators),
+                     len(self.index.zones))
+
+        return True
+
+    def watch(self):
+        """ Poll the file for a new crawl result until stopped. """
+        while not self.stopped.wait(self.reload_time):
+            self.reload()
+
+    def serve_forever(self):
+        """ Load the crawl result and serve the queries. """
+        self.reload()
+
+        watcher = threading.Thread(target=self.watch)
+        watcher.daemon = True
+        watcher.start()
+
+        self.server = TariffHTTPServer(
+            (self.host, self.port), TariffRequestHandler, self)
+        logging.info('Serving \'%s\' on http://%s:%d/',
+                     self.file_name, self.host, self.port)
+        try:
+            self.server.serve_forever()
+        finally:
+            self.stopped.set()
+            self.server.server_close()
@@ -8,12 +8,14 @@ A web crawler for networks’ international calling costs.
 
 from __future__ import print_function
 
+import heapq
 import json
 import os
 import re
 import sys
 import time
 import textwrap
+import collections
 import argparse
 import logging
 import coloredlogs
@@ -24,7 +26,8 @@ try:
 except ImportError as imp_err:
     raise ImportError('Failed to import \'selenium\':\n' + str(imp_err))
 
-from __init__ import __version__, OperatorWebSite
+from __init__ import __version__, OperatorWebSite, AsyncOperatorWebSite, \
+    TariffService
 
 
 SCRIPT = os.path.basename(__file__)
@@ -60,37 +63,102 @@ def is_number(value):
     return is_int(value) or is_float(value)
 
 
-def process_actions(zone, operator_obj, sleep_time):
-    """ Processes all the required actions. """
-    res = None
+def positive_int(value):
+    """ Argument type for an int greater than zero. """
+    if not is_int(value) or int(value) < 1:
+        raise argparse.ArgumentTypeError(
+            '\'%s\' is not a positive integer' % value)
+
+    return int(value)
 
+
+def is_cost(value):
+    """ Reports whether an action result is a cost. """
+    return isinstance(value, basestring) and is_number(value)
+
+
+def get_action_args(zone, action_data):
+    """ Returns the name and the arguments of an action. """
     # Dict containing a list of additional
     # arguments for each available action
     additional_args = {
         'type_zone': {'zone': zone}}
 
+    action_name = action_data.keys()[0]
+    path = action_data.values()[0]
+
+    action_args = {'path': path}
+
+    # Add additional action arguments
+    if action_name in additional_args:
+        key = additional_args[action_name].keys()[0]
+        value = additional_args[action_name].values()[0]
+        action_args[key] = value
+
+    return action_name, action_args
+
+
+def run_actions(zone, operator_obj):
+    """
+    Runs the required actions one at a time.
+
+    It yields the result of each action, so that the caller can
+    wait or switch to another operator between two actions.
+    """
     # Process each action
     for action_data in operator_obj.get_actions():
-        action_name = action_data.keys()[0]
-        path = action_data.values()[0]
+        action_name, action_args = get_action_args(zone, action_data)
+
+        # Execute the requested web driver action
+        method = operator_obj.get_attr(operator_obj, action_name)
+
+        # Stop processing the current zone if the method execution
+        # fails or its element was not loaded
+        res = method(action_args)
+        if res is None or res is False:
+            logging.error('Action \'%s\' failed, skipping zone \'%s\'',
+                          action_name, zone)
+            yield res
+            return
 
-        action_args = {'path': path}
+        yield res
 
-        # Add additional action arguments
-        if action_name in additional_args:
-            key = additional_args[action_name].keys()[0]
-            value = additional_args[action_name].values()[0]
-            action_args[key] = value
 
-        # Execute the requested web driver action
+def run_async_actions(zone, operator_obj, sleep_time):
+    """
+    Runs the required actions without blocking.
+
+    It yields the number of seconds to wait before being resumed.
+    The result of the last action is left in operator_obj.result.
+    """
+    operator_obj.result = None
+
+    # Process each action
+    for action_data in operator_obj.get_actions():
+        action_name, action_args = get_action_args(zone, action_data)
+
+        # Wait for the requested web driver action
         method = operator_obj.get_attr(operator_obj, action_name)
+        for delay in method(action_args):
+            yield delay
 
         # Stop processing the current zone
         # if the method execution fails
-        res = method(action_args)
-        if res is None:
+        if operator_obj.result is None:
             logging.error('Action \'%s\' failed, skipping zone \'%s\'',
                           action_name, zone)
+            return
+
+        logging.debug('Sleeping %s seconds ', str(sleep_time))
+        yield sleep_time
+
+
+def process_actions(zone, operator_obj, sleep_time):
+    """ Processes all the required actions. """
+    res = None
+
+    for res in run_actions(zone, operator_obj):
+        if res is None or res is False:
             break
 
         logging.debug('Sleeping %s seconds ', str(sleep_time))
@@ -121,6 +189,155 @@ def log(msg, not_new_line=None):
             print(msg + os.linesep, file=script_args.out)
 
 
+def log_cost(zone, cost):
+    """ Log the cost of a zone. """
+    log('\t\t{}'.format(zone).ljust(30), not_new_line=True)
+
+    # Check if the result is a number
+    if is_cost(cost):
+        logging.info('Cost: %s', cost)
+        log('%s' % cost.rjust(10))
+        return True
+
+    logging.error('Cost does not appear to be a number')
+    return False
+
+
+def run_tasks(tasks):
+    """
+    Runs the tasks cooperatively in the current thread.
+
+    Each task is a generator yielding the number of seconds to wait
+    before resuming it. While a task waits, the other tasks are run.
+    """
+    # Tasks are ordered by the time they can run next
+    queue = [(time.time(), order, task) for order, task in enumerate(tasks)]
+    heapq.heapify(queue)
+
+    while queue:
+        ready_time, order, task = heapq.heappop(queue)
+        delay = ready_time - time.time()
+        if delay > 0:
+            time.sleep(delay)
+
+        try:
+            delay = next(task)
+        except StopIteration:
+            continue
+
+        heapq.heappush(queue, (time.time() + (delay or 0), order, task))
+
+
+def log_results(results):
+    """ Log the costs of each operator once all the zones are done. """
+    for operator, costs in results:
+        log('Operator:\t%s\nURL:\t\t%s' % (operator['name'], operator['url']))
+        log('Country zones:\t')
+        for zone in operator['zones']:
+            if zone not in costs:
+                logging.error('No cost found for zone \'%s\'', zone)
+                continue
+
+            log_cost(zone, costs[zone])
+
+        # Add the costs to the output object
+        if script_args.json is not None:
+            operator["costs"] = costs
+
+
+def crawl_zones(operator_obj, costs, sleep_time):
+    """
+    Crawls all the zones of an operator one action at a time.
+
+    It yields after each action and adds the costs to the given dict.
+    """
+    for zone in operator_obj.get_zones():
+        logging.info('Zone: %s\t', zone)
+        cost = None
+        for cost in run_actions(zone, operator_obj):
+            yield sleep_time
+
+        if is_cost(cost):
+            costs[zone] = cost
+
+
+def process_tabs(driver, data):
+    """
+    Process all the operators in a single browser, one tab each.
+
+    All the pages are loaded at the same time and the actions of the
+    different operators are interleaved: while an operator sleeps after
+    an action, the actions of the other operators are executed.
+    """
+    tasks = []
+    results = []
+    for operator in data['operators']:
+        logging.info('Operator: %s', operator['name'])
+        logging.info('URL: %s', operator['url'])
+
+        # Open the operator web site in its own tab
+        operator_obj = OperatorWebSite.open_tab(driver, operator)
+        costs = dict()
+        results.append((operator, costs))
+        tasks.append(crawl_zones(operator_obj, costs, operator['sleep_time']))
+
+    run_tasks(tasks)
+    log_results(results)
+
+
+def crawl_worker(driver, zones):
+    """
+    Crawls zones from the shared queue until it is empty.
+
+    The worker owns a browser tab, which is reopened
+    whenever the next zone belongs to another operator.
+    """
+    operator_obj = None
+    current = None
+    while zones:
+        operator, costs, zone = zones.popleft()
+        if operator is not current:
+            if operator_obj is not None:
+                operator_obj.close_tab()
+            operator_obj = AsyncOperatorWebSite.open_tab(driver, operator)
+            current = operator
+
+        logging.info('Zone: %s\t', zone)
+        for delay in run_async_actions(
+                zone, operator_obj, operator['sleep_time']):
+            yield delay
+
+        if is_cost(operator_obj.result):
+            costs[zone] = operator_obj.result
+
+    if operator_obj is not None:
+        operator_obj.close_tab()
+
+
+def process_concurrent(driver, data, concurrency):
+    """
+    Process the zones of all the operators concurrently.
+
+    Up to 'concurrency' zones are crawled at the same time, each one in
+    its own tab. Waiting for a page element or sleeping after an action
+    never blocks the other zones.
+    """
+    zones = collections.deque()
+    results = []
+    for operator in data['operators']:
+        logging.info('Operator: %s', operator['name'])
+        logging.info('URL: %s', operator['url'])
+
+        costs = dict()
+        results.append((operator, costs))
+        for zone in operator['zones']:
+            zones.append((operator, costs, zone))
+
+    workers = min(concurrency, len(zones))
+    run_tasks([crawl_worker(driver, zones) for _ in range(workers)])
+    log_results(results)
+
+
 def process_data(data):
     """ Parse the JSON object containing the data. """
     driver = None
@@ -128,6 +345,16 @@ def process_data(data):
         # Chrome driver
         driver = webdriver.Chrome()
 
+        # Process the zones concurrently
+        if script_args.concurrency is not None:
+            process_concurrent(driver, data, script_args.concurrency)
+            return
+
+        # Process the operators in parallel tabs
+        if script_args.tabs:
+            process_tabs(driver, data)
+            return
+
         # Process each operator
         for operator in data['operators']:
             name = operator['name']
@@ -151,18 +378,12 @@ def process_data(data):
             log('Country zones:\t')
             for zone in operator_obj.get_zones():
                 logging.info('Zone: %s\t', zone)
-                log('\t\t{}'.format(zone).ljust(30), not_new_line=True)
 
                 cost = process_actions(
                     zone, operator_obj, operator['sleep_time'])
 
-                # Check if the result is a number
-                if is_number(cost):
-                    logging.info('Cost: %s', cost)
-                    log('%s' % cost.rjust(10))
+                if log_cost(zone, cost):
                     costs[zone] = cost
-                else:
-                    logging.error('Cost does not appear to be a number')
 
             # Add the costs to the output object
             if script_args.json is not None:
@@ -175,7 +396,10 @@ def process_data(data):
         # Close and quit the browser
         if driver is not None:
             logging.debug('Closing web driver')
-            driver.close()
+            if script_args.tabs or script_args.concurrency is not None:
+                driver.quit()
+            else:
+                driver.close()
 
 
 def load_data(file_name):
@@ -272,16 +496,42 @@ def get_args():
         formatter_class=argparse.RawTextHelpFormatter,
         description=__doc__)
 
-    # Optional args
-    parser.add_argument(
+    # Either crawl or serve a previous crawl
+    mode = parser.add_mutually_exclusive_group(required=True)
+    mode.add_argument(
         '--data',
         metavar='[file]',
         type=str,
-        required=True,
         help=textwrap.dedent("""\
         File containing the operator URL,
         the list of country zones and the file
         structure for the Selenium driver."""))
+    mode.add_argument(
+        '--serve',
+        metavar='[file]',
+        type=str,
+        help=textwrap.dedent("""\
+        Serve a JSON crawl result over a local
+        HTTP API, reloading it whenever
+        a new crawl is written."""))
+
+    # Either one tab per operator or one tab per zone
+    tabs = parser.add_mutually_exclusive_group()
+    tabs.add_argument(
+        '--concurrency',
+        metavar='[n]',
+        type=positive_int,
+        help=textwrap.dedent("""\
+        Crawl up to n zones at the same time
+        in a single browser, one tab each."""))
+    tabs.add_argument(
+        '--tabs',
+        action='store_true',
+        help=textwrap.dedent("""\
+        Crawl all the operators in a single
+        browser, one tab each."""))
+
+    # Optional args
     parser.add_argument(
         '-h',
         '--help',
@@ -316,6 +566,13 @@ def get_args():
         metavar='[of]',
         type=str,
         help='Write output to file (default STDOUT).')
+    parser.add_argument(
+        '--port',
+        metavar='[port]',
+        type=int,
+        default=8080,
+        help=textwrap.dedent("""\
+        Port used by --serve (default 8080)."""))
     parser.add_argument(
         '-q',
         '--quiet',
@@ -337,6 +594,11 @@ def main():
         global script_args
         script_args = get_args()
         init_log()
+        if script_args.serve is not None:
+            service = TariffService(
+                os.path.abspath(script_args.serve), port=script_args.port)
+            service.serve_forever()
+            return os.EX_OK
         if script_args.out is not None:
             init_out_file()
         data = load_data(os.path.abspath(script_args.data))
@@ -8,10 +8,20 @@ import unittest
 try:
     from selenium import webdriver
     from selenium.common.exceptions import WebDriverException
+    from selenium.common.exceptions import NoSuchElementException
+    from selenium.common.exceptions import NoSuchWindowException
 except ImportError as imp_err:
     raise ImportError('Failed to import \'selenium\':\n' + str(imp_err))
 
 from network_crawler.api.operator_web_site import OperatorWebSite
+from network_crawler.api.async_operator_web_site import AsyncOperatorWebSite
+from network_crawler.api.tariff_service import TariffIndex, TariffService, \
+    TariffHTTPServer, TariffRequestHandler
+from network_crawler import network_crawler
 
 __all__ = ['json', 'os', 'time', 'unittest',
-           'webdriver', 'WebDriverException', 'OperatorWebSite', ]
+           'webdriver', 'WebDriverException', 'NoSuchElementException',
+           'NoSuchWindowException',
+           'OperatorWebSite', 'AsyncOperatorWebSite',
+           'TariffIndex', 'TariffService', 'TariffHTTPServer',
+           'TariffRequestHandler', 'network_crawler', ]
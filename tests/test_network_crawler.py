@@ -0,0 +1,202 @@
+"""Tab and concurrent crawl engines unit test."""
+
+import argparse
+
+from __init__ import unittest, NoSuchElementException, \
+    NoSuchWindowException, network_crawler
+
+
+COSTS = {
+    'http://o2': {'Canada': '1.50', 'Iceland': '2.00'},
+    'http://vodafone': {'Pakistan': '0.75'},
+}
+
+
+def get_operator(name, url, zones):
+    """Returns the data of an operator."""
+    return {
+        'name': name,
+        'url': url,
+        'actions': [
+            {'type_zone': 'zone_input'},
+            {'click': 'button'},
+            {'get_cost': 'cost'},
+        ],
+        'load_time': 0,
+        'sleep_time': 0,
+        'zones': zones,
+    }
+
+
+class StubElement(object):
+    """Page element of a StubDriver tab."""
+
+    def __init__(self, driver):
+        self.driver = driver
+
+    def send_keys(self, keys):
+        self.driver.zones[self.driver.current_window_handle] = keys.strip()
+
+    def click(self):
+        pass
+
+    @property
+    def text(self):
+        url = self.driver.urls[self.driver.current_window_handle]
+        zone = self.driver.zones.get(self.driver.current_window_handle)
+        return COSTS[url].get(zone, 'n/a')
+
+
+class StubDriver(object):
+    """
+    Web driver stub with one page element per XPath.
+
+    Like Selenium, it fails to run any command
+    once the selected window has been closed.
+    """
+
+    def __init__(self):
+        self.window_handles = ['tab0']
+        self.current_window_handle = 'tab0'
+        self.urls = {}
+        self.zones = {}
+        self.missing = set()
+        self.lookups = 0
+        self.switch_to = self
+
+    def check_window(self):
+        if self.current_window_handle not in self.window_handles:
+            raise NoSuchWindowException()
+
+    def window(self, handle):
+        if handle not in self.window_handles:
+            raise NoSuchWindowException()
+        self.current_window_handle = handle
+
+    def execute_script(self, script, url):
+        self.check_window()
+        handle = 'tab%d' % (len(self.urls) + 1)
+        self.window_handles.append(handle)
+        self.urls[handle] = url
+
+    def close(self):
+        self.check_window()
+        self.window_handles.remove(self.current_window_handle)
+
+    def find_elements(self, by, path):
+        self.check_window()
+        self.lookups += 1
+        if path in self.missing:
+            return []
+        return [StubElement(self)]
+
+    def find_element(self, by, path):
+        elements = self.find_elements(by, path)
+        if not elements:
+            raise NoSuchElementException()
+        return elements[0]
+
+
+class TestRunTasks(unittest.TestCase):
+    """Unit test class for run_tasks."""
+
+    def test_order(self):
+        events = []
+
+        def slow_task():
+            events.append('slow_1')
+            yield 0.05
+            events.append('slow_2')
+
+        def fast_task():
+            events.append('fast_1')
+            yield 0
+            events.append('fast_2')
+            yield 0
+            events.append('fast_3')
+
+        network_crawler.run_tasks([slow_task(), fast_task()])
+        self.assertEqual(events,
+                         ['slow_1', 'fast_1', 'fast_2', 'fast_3', 'slow_2'])
+
+
+class CrawlTestCase(unittest.TestCase):
+    """Base class for the crawl tests using a StubDriver."""
+
+    # Zones of each operator
+    o2_zones = ['Canada', 'Iceland']
+    vodafone_zones = ['Pakistan']
+
+    def setUp(self):
+        """Setup."""
+        network_crawler.script_args = argparse.Namespace(
+            json=True, quiet=True, out=None)
+        self.driver = StubDriver()
+        self.data = {'operators': [
+            get_operator('O2', 'http://o2', self.o2_zones),
+            get_operator('Vodafone', 'http://vodafone', self.vodafone_zones),
+        ]}
+
+    def get_costs(self):
+        """Returns the costs of each operator."""
+        return [operator['costs'] for operator in self.data['operators']]
+
+
+class TestProcessConcurrent(CrawlTestCase):
+    """Unit test class for process_concurrent and crawl_worker."""
+
+    def test_worker_across_operators(self):
+        network_crawler.process_concurrent(self.driver, self.data, 1)
+        self.assertEqual(self.get_costs(), [
+            {'Canada': '1.50', 'Iceland': '2.00'}, {'Pakistan': '0.75'}])
+        # All the worker tabs are closed
+        self.assertEqual(self.driver.window_handles, ['tab0'])
+
+    def test_concurrency(self):
+        network_crawler.process_concurrent(self.driver, self.data, 2)
+        self.assertEqual(self.get_costs(), [
+            {'Canada': '1.50', 'Iceland': '2.00'}, {'Pakistan': '0.75'}])
+        self.assertEqual(self.driver.window_handles, ['tab0'])
+
+    def test_missing_element(self):
+        self.driver.missing.add('zone_input')
+        network_crawler.process_concurrent(self.driver, self.data, 1)
+        self.assertEqual(self.get_costs(), [{}, {}])
+        # Each zone is skipped after its first failed action
+        self.assertEqual(self.driver.lookups, 3)
+
+
+class TestProcessTabs(CrawlTestCase):
+    """Unit test class for process_tabs and crawl_zones."""
+
+    o2_zones = ['Canada', 'Greenland', 'Iceland']
+
+    def test_costs(self):
+        network_crawler.process_tabs(self.driver, self.data)
+        # Greenland has no cost on the page and is skipped
+        self.assertEqual(self.get_costs(), [
+            {'Canada': '1.50', 'Iceland': '2.00'}, {'Pakistan': '0.75'}])
+        # One tab per operator
+        self.assertEqual(self.driver.window_handles,
+                         ['tab0', 'tab1', 'tab2'])
+
+    def test_missing_element(self):
+        self.driver.missing.add('zone_input')
+        network_crawler.process_tabs(self.driver, self.data)
+        self.assertEqual(self.get_costs(), [{}, {}])
+        # Each zone is skipped after its first failed action
+        self.assertEqual(self.driver.lookups, 4)
+
+
+class TestGetArgs(unittest.TestCase):
+    """Unit test class for the command-line argument types."""
+
+    def test_positive_int(self):
+        self.assertEqual(network_crawler.positive_int('3'), 3)
+        for value in ('0', '-1', 'n'):
+            self.assertRaises(argparse.ArgumentTypeError,
+                              network_crawler.positive_int, value)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -51,7 +51,7 @@ class TestOperatorWebSite(unittest.TestCase):
     def tearDown(self):
         """Tear down."""
         # Close and quit the browser
-        self.driver.close()
+        self.driver.quit()
 
     def run_action(self, action_name, action_args=None):
         """Run a specific OperatorWebSite action."""
@@ -90,6 +90,14 @@ class TestOperatorWebSite(unittest.TestCase):
         res = self.run_action(action, args)
         self.assertTrue(res, ('Action \'%s\' failed', action))
 
+    def test_open_tab(self):
+        operator_obj = OperatorWebSite.open_tab(self.driver, self.data)
+        self.assertIn(operator_obj.window_handle, self.driver.window_handles)
+        self.operator_obj = operator_obj
+        self.test_type_zone()
+        self.assertEqual(self.driver.current_window_handle,
+                         operator_obj.window_handle)
+
     def test_not_action(self):
         self.assertRaises(AssertionError, self.run_action, "not_action")
 
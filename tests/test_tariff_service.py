@@ -0,0 +1,176 @@
+"""TariffIndex, TariffService and TariffRequestHandler classes unit test."""
+
+import tempfile
+import threading
+
+try:
+    from urllib2 import urlopen, HTTPError
+except ImportError:
+    from urllib.request import urlopen
+    from urllib.error import HTTPError
+
+from __init__ import json, os, unittest, TariffIndex, TariffService, \
+    TariffHTTPServer, TariffRequestHandler
+
+
+DATA = {
+    'operators': [
+        {'name': 'O2',
+         'costs': {'Canada': '2.00', 'Pakistan': '1.50'}},
+        {'name': 'Vodafone',
+         'costs': {'Canada': '1.00', 'Pakistan': 'n/a'}},
+    ]
+}
+
+
+class TestTariffIndex(unittest.TestCase):
+    """Unit test class for TariffIndex."""
+
+    def setUp(self):
+        """Setup."""
+        self.index = TariffIndex(DATA)
+
+    def test_get_operators(self):
+        self.assertEqual(self.index.get_operators(), ['O2', 'Vodafone'])
+
+    def test_get_zones(self):
+        self.assertEqual(self.index.get_zones(), ['Canada', 'Pakistan'])
+
+    def test_get_operator(self):
+        res = self.index.get_operator('o2')
+        self.assertEqual(res['costs'], {'Canada': 2.0, 'Pakistan': 1.5})
+        self.assertIsNone(self.index.get_operator('not_operator'))
+
+    def test_get_zone(self):
+        res = self.index.get_zone('canada')
+        self.assertEqual([entry['operator'] for entry in res['ranking']],
+                         ['Vodafone', 'O2'])
+
+    def test_get_cheapest(self):
+        res = self.index.get_cheapest('Pakistan')
+        self.assertEqual(res, {'zone': 'Pakistan', 'operator': 'O2',
+                               'cost': 1.5})
+        self.assertIsNone(self.index.get_cheapest('not_zone'))
+
+
+class TestTariffService(unittest.TestCase):
+    """Unit test class for TariffService."""
+
+    def setUp(self):
+        """Setup."""
+        fd, self.file_name = tempfile.mkstemp(suffix='.json')
+        os.close(fd)
+        self.service = TariffService(self.file_name)
+
+    def tearDown(self):
+        """Tear down."""
+        os.remove(self.file_name)
+
+    def write_data(self, text):
+        """Write the crawl result file."""
+        with open(self.file_name, 'w') as data_file:
+            data_file.write(text)
+
+    def test_reload(self):
+        self.write_data(json.dumps(DATA))
+        self.assertTrue(self.service.reload())
+        self.assertEqual(self.service.index.get_operators(),
+                         ['O2', 'Vodafone'])
+        # Unchanged file
+        self.assertFalse(self.service.reload())
+
+    def test_reload_invalid(self):
+        self.write_data(json.dumps(DATA))
+        self.service.reload()
+        index = self.service.index
+        # Partially written crawl result
+        self.write_data('{"operators": [')
+        self.assertFalse(self.service.reload())
+        self.assertIs(self.service.index, index)
+
+    def test_reload_wrong_shape(self):
+        self.write_data(json.dumps(DATA))
+        self.service.reload()
+        index = self.service.index
+        # Valid JSON which is not a crawl result
+        for data in ([], {'operators': [{'costs': {}}]},
+                     {'operators': [{'name': 'O2', 'costs': []}]}):
+            self.write_data(json.dumps(data))
+            self.assertFalse(self.service.reload())
+            self.assertIs(self.service.index, index)
+
+
+class TestTariffRequestHandler(unittest.TestCase):
+    """Unit test class for TariffRequestHandler."""
+
+    def setUp(self):
+        """Setup."""
+        data = {'operators': DATA['operators'] + [
+            {'name': 'Three',
+             'costs': {u'R\xe9union': '3.00', 'South Africa': '0.50'}},
+        ]}
+        service = TariffService(None)
+        # Names are unicode when loaded from a crawl result
+        service.index = TariffIndex(json.loads(json.dumps(data)))
+
+        # Listen on an ephemeral port
+        self.server = TariffHTTPServer(
+            ('127.0.0.1', 0), TariffRequestHandler, service)
+        self.thread = threading.Thread(target=self.server.serve_forever)
+        self.thread.daemon = True
+        self.thread.start()
+
+    def tearDown(self):
+        """Tear down."""
+        self.server.shutdown()
+        self.server.server_close()
+
+    def get(self, path):
+        """Returns the status and the JSON body of a GET request."""
+        url = 'http://127.0.0.1:%d%s' % (self.server.server_address[1], path)
+        try:
+            res = urlopen(url)
+        except HTTPError as err:
+            res = err
+        try:
+            return res.getcode(), json.loads(res.read().decode('utf-8'))
+        finally:
+            res.close()
+
+    def test_operators(self):
+        self.assertEqual(self.get('/operators'),
+                         (200, ['O2', 'Three', 'Vodafone']))
+
+    def test_operator(self):
+        code, res = self.get('/operators/o2')
+        self.assertEqual(code, 200)
+        self.assertEqual(res['costs'], {'Canada': 2.0, 'Pakistan': 1.5})
+
+    def test_zones(self):
+        self.assertEqual(self.get('/zones/'), (200, [
+            'Canada', 'Pakistan', u'R\xe9union', 'South Africa']))
+
+    def test_zone(self):
+        code, res = self.get('/zones/South%20Africa')
+        self.assertEqual(code, 200)
+        self.assertEqual(res['ranking'], [{'operator': 'Three', 'cost': 0.5}])
+
+    def test_cheapest(self):
+        self.assertEqual(self.get('/zones/canada/cheapest?format=json'), (
+            200, {'zone': 'Canada', 'operator': 'Vodafone', 'cost': 1.0}))
+
+    def test_non_ascii(self):
+        self.assertEqual(self.get('/zones/R%C3%A9union/cheapest'), (
+            200, {'zone': u'R\xe9union', 'operator': 'Three', 'cost': 3.0}))
+        self.assertEqual(self.get('/zones/r%C3%A9UNION')[0], 200)
+
+    def test_not_found(self):
+        for path in ('/', '/zones/not_zone', '/operators/not_operator',
+                     '/zones/Canada/not_route', '/operators/O2/cheapest'):
+            code, res = self.get(path)
+            self.assertEqual(code, 404, path)
+            self.assertIn('error', res)
+
+
+if __name__ == '__main__':
+    unittest.main()